@@ -2,35 +2,141 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import bisect
+import hashlib
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+from urllib.parse import urlsplit
 
 import redis.asyncio as aioredis
 
 from .config import Settings
 
 
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def node_id(url: str) -> str:
+    """Ring name for a Redis URL: ``host:port``, independent of scheme and credentials."""
+
+    parts = urlsplit(url)
+    host = parts.hostname or parts.path
+    return f"{host}:{parts.port or 6379}"
+
+
+class HashRing:
+    """Consistent hash ring mapping keys onto node names.
+
+    Each node is placed on the ring ``replicas`` times so keys spread evenly,
+    and adding or removing a node only remaps roughly ``1/len(nodes)`` of keys.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 160) -> None:
+        points = sorted((_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas))
+        if not points:
+            raise ValueError("hash ring requires at least one node")
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
 class RedisCache:
-    """Async Redis cache helper for storing MX and verdict data."""
+    """Async Redis cache helper for storing MX and verdict data.
+
+    Keys are routed across ``redis_urls`` (or the single ``redis_url``) with a
+    consistent hash ring; multi-key operations are split per shard and the
+    shards are queried concurrently. Nodes are placed on the ring by
+    ``host:port`` (or the keys of ``clients``), so rotating passwords or
+    switching to ``rediss://`` does not move keys.
 
-    def __init__(self, settings: Settings) -> None:
+    Keys are not migrated when nodes are added: counters that move to a new
+    node (``rate:*``, ``q:count:*``, ``quota:used:*``) restart from zero there.
+    """
+
+    def __init__(self, settings: Settings, clients: Mapping[str, aioredis.Redis] | None = None) -> None:
         self._settings = settings
-        self._client = aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+        if clients is None:
+            urls = settings.redis_urls or [settings.redis_url]
+            clients = {}
+            for url in urls:
+                name = node_id(url)
+                if name in clients:
+                    raise ValueError(f"duplicate redis node {name}")
+                clients[name] = aioredis.from_url(url, encoding="utf-8", decode_responses=True)
+        self._clients: Dict[str, aioredis.Redis] = dict(clients)
+        self._ring = HashRing(self._clients)
 
     @property
     def client(self) -> aioredis.Redis:
-        return self._client
+        """Client of the first configured node."""
+
+        return next(iter(self._clients.values()))
+
+    def client_for(self, key: str) -> aioredis.Redis:
+        return self._clients[self._ring.node_for(key)]
 
     async def get(self, key: str) -> str | None:
-        return await self._client.get(key)
+        return await self.client_for(key).get(key)
 
-    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
-        await self._client.set(key, value, ex=ttl)
+    async def set(self, key: str, value: Any, ttl: int | None = None, nx: bool = False) -> None:
+        await self.client_for(key).set(key, value, ex=ttl, nx=nx)
 
     async def incr(self, key: str) -> int:
-        return await self._client.incr(key)
+        return await self.client_for(key).incr(key)
+
+    async def incrby(self, key: str, amount: int) -> int:
+        return await self.client_for(key).incrby(key, amount)
+
+    async def decrby(self, key: str, amount: int) -> int:
+        return await self.client_for(key).decrby(key, amount)
 
     async def expire(self, key: str, ttl: int) -> None:
-        await self._client.expire(key, ttl)
+        await self.client_for(key).expire(key, ttl)
+
+    async def hset(self, key: str, mapping: Mapping[str, Any]) -> None:
+        await self.client_for(key).hset(key, mapping=mapping)
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        return await self.client_for(key).hdel(key, *fields)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return await self.client_for(key).hgetall(key)
+
+    async def mget(self, keys: Sequence[str]) -> List[str | None]:
+        """Fetch many keys with one MGET per shard, preserving ``keys`` order."""
+
+        values: List[str | None] = [None] * len(keys)
+
+        async def fetch(node: str, indices: List[int]) -> None:
+            found = await self._clients[node].mget([keys[index] for index in indices])
+            for index, value in zip(indices, found):
+                values[index] = value
+
+        await asyncio.gather(*(fetch(node, indices) for node, indices in self._group_by_node(keys).items()))
+        return values
+
+    async def incrby_many(self, amounts: Mapping[str, int]) -> None:
+        """Apply many increments with one pipeline per shard."""
+
+        keys = list(amounts)
+
+        async def apply(node: str, indices: List[int]) -> None:
+            async with self._clients[node].pipeline(transaction=False) as pipe:
+                for index in indices:
+                    pipe.incrby(keys[index], amounts[keys[index]])
+                await pipe.execute()
+
+        await asyncio.gather(*(apply(node, indices) for node, indices in self._group_by_node(keys).items()))
 
     async def close(self) -> None:
-        await self._client.close()
+        await asyncio.gather(*(client.close() for client in self._clients.values()))
+
+    def _group_by_node(self, keys: Sequence[str]) -> Dict[str, List[int]]:
+        groups: Dict[str, List[int]] = {}
+        for index, key in enumerate(keys):
+            groups.setdefault(self._ring.node_for(key), []).append(index)
+        return groups
@@ -0,0 +1,69 @@
+"""Provider-aware email canonicalization."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class ProviderRule:
+    """How a mailbox provider maps address variants onto a single mailbox."""
+
+    canonical_domain: str
+    strip_dots: bool = False
+    plus_addressing: bool = True
+
+
+_GMAIL = ProviderRule("gmail.com", strip_dots=True)
+
+PROVIDER_RULES: Dict[str, ProviderRule] = {
+    "gmail.com": _GMAIL,
+    "googlemail.com": _GMAIL,
+    "outlook.com": ProviderRule("outlook.com"),
+    "outlook.fr": ProviderRule("outlook.fr"),
+    "hotmail.com": ProviderRule("hotmail.com"),
+    "hotmail.fr": ProviderRule("hotmail.fr"),
+    "hotmail.co.uk": ProviderRule("hotmail.co.uk"),
+    "live.com": ProviderRule("live.com"),
+    "live.fr": ProviderRule("live.fr"),
+    "icloud.com": ProviderRule("icloud.com"),
+    "me.com": ProviderRule("me.com"),
+    "mac.com": ProviderRule("mac.com"),
+    "fastmail.com": ProviderRule("fastmail.com"),
+    "protonmail.com": ProviderRule("protonmail.com"),
+    "proton.me": ProviderRule("proton.me"),
+    "pm.me": ProviderRule("pm.me"),
+}
+
+
+@dataclass(frozen=True)
+class CanonicalEmail:
+    local_part: str
+    domain: str
+
+    @property
+    def address(self) -> str:
+        return f"{self.local_part}@{self.domain}"
+
+
+def canonicalize(email: str) -> CanonicalEmail:
+    """Map an address onto the mailbox it is delivered to.
+
+    Addresses are lowercased everywhere; plus-address tags, Gmail dots and
+    domain aliases are only folded for providers listed in ``PROVIDER_RULES``,
+    since other mail servers may treat them as distinct mailboxes.
+    """
+
+    local_part, domain = email.split("@", 1)
+    local_part, domain = local_part.lower(), domain.lower()
+    rule = PROVIDER_RULES.get(domain)
+    if rule is None:
+        return CanonicalEmail(local_part, domain)
+
+    mailbox = local_part
+    if rule.plus_addressing:
+        mailbox = mailbox.split("+", 1)[0]
+    if rule.strip_dots:
+        mailbox = mailbox.replace(".", "")
+    return CanonicalEmail(mailbox or local_part, rule.canonical_domain)
@@ -12,7 +12,8 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
     api_keys: list[str] | str | None = Field(default=None)
-    redis_url: str = Field(...)
+    redis_url: str | None = Field(default=None)
+    redis_urls: list[str] | str | None = Field(default=None)
     cache_ttl_seconds: int = Field(86400)
     sentry_dsn: str | None = Field(default=None)
     region_hint: str | None = Field(default=None)
@@ -23,6 +24,14 @@ class Settings(BaseSettings):
     disposable_score_threshold: float = Field(0.8)
     max_bulk_batch: int = Field(100)
     rate_limit_per_second: int = Field(10)
+    default_monthly_quota: int = Field(25000)
+    quota_lease_size: int = Field(50)
+    quota_limit_refresh_seconds: float = Field(300.0)
+    quota_store_path: str | None = Field(default=None)
+    quota_sync_interval_seconds: float = Field(30.0)
+    debug_api_keys: list[str] | str | None = Field(default=None)
+    admin_api_keys: list[str] | str | None = Field(default=None)
+    profile_max_seconds: float = Field(30.0)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -32,15 +41,18 @@ class Settings(BaseSettings):
 
     @model_validator(mode="after")
     def normalize_api_keys(self) -> "Settings":
-        value = self.api_keys
-        normalized: list[str]
-        if value is None:
-            normalized = []
-        elif isinstance(value, str):
-            normalized = [item.strip() for item in value.split(",") if item.strip()]
-        else:
-            normalized = [str(item).strip() for item in value if str(item).strip()]
-        object.__setattr__(self, "api_keys", normalized)
+        for field_name in ("api_keys", "debug_api_keys", "admin_api_keys", "redis_urls"):
+            value = getattr(self, field_name)
+            normalized: list[str]
+            if value is None:
+                normalized = []
+            elif isinstance(value, str):
+                normalized = [item.strip() for item in value.split(",") if item.strip()]
+            else:
+                normalized = [str(item).strip() for item in value if str(item).strip()]
+            object.__setattr__(self, field_name, normalized)
+        if not self.redis_url and not self.redis_urls:
+            raise ValueError("redis_url or redis_urls must be set")
         return self
 
 
@@ -8,15 +8,19 @@ import math
 import pathlib
 import re
 from contextlib import suppress
-from typing import Iterable, List, Tuple
+from dataclasses import dataclass
+from typing import Iterable, List, Mapping, Sequence, Tuple
 
 import dns.exception
 import dns.resolver
 from pydantic import EmailStr
 
 from .cache import RedisCache
+from .canonical import CanonicalEmail, canonicalize
 from .config import Settings
+from .lookalike import LookalikeIndex
 from .models import Classification, EmailCheckRequest, EmailCheckResult
+from .timing import flag, stage
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,13 @@ KEYWORD_PATTERNS: Tuple[re.Pattern[str], ...] = tuple(
 )
 
 
+@dataclass(frozen=True)
+class _DomainCheck:
+    score: float
+    reasons: Tuple[str, ...]
+    suggested_domain: str | None
+
+
 class EmailDetector:
     """Encapsulates blocklist loading, MX lookups, and heuristic scoring."""
 
@@ -42,6 +53,7 @@ class EmailDetector:
         self._settings = settings
         self._cache = cache
         self._blocklist: set[str] = set()
+        self._lookalikes = LookalikeIndex()
         self._resolver = dns.resolver.Resolver(configure=True)
         self._resolver.lifetime = settings.mx_timeout_seconds
         self._resolver.timeout = settings.mx_timeout_seconds
@@ -75,40 +87,87 @@ class EmailDetector:
     async def classify(self, request: EmailCheckRequest) -> EmailCheckResult:
         """Classify a single email."""
 
-        email = request.email
-        local_part, domain = self._split_email(email)
+        canonical = canonicalize(request.email)
+        return self._score(request.email, canonical, await self._check_domain(canonical.domain))
+
+    async def classify_many(self, requests: Sequence[EmailCheckRequest]) -> List[EmailCheckResult]:
+        """Classify a batch, doing the domain and MX work once per canonical domain.
+
+        Local-part heuristics still run on every original address, since
+        canonicalization drops tags (``john+temp``) that carry signal. Results
+        keep the order of ``requests``.
+        """
+
+        canonicals = [canonicalize(request.email) for request in requests]
+        domains = list({canonical.domain for canonical in canonicals})
+        with stage("mx-prefetch"):
+            cached = await self._cache.mget([f"mx:{domain}" for domain in domains])
+        prefetched_mx = dict(zip(domains, cached))
+        checks = await asyncio.gather(*(self._check_domain(domain, prefetched_mx) for domain in domains))
+        by_domain = dict(zip(domains, checks))
+        return [
+            self._score(request.email, canonical, by_domain[canonical.domain])
+            for request, canonical in zip(requests, canonicals)
+        ]
+
+    async def _check_domain(
+        self,
+        domain: str,
+        prefetched_mx: Mapping[str, str | None] | None = None,
+    ) -> _DomainCheck:
         score = 0.0
         reasons: List[str] = []
 
-        if domain in self._blocklist:
-            score += 0.9
-            reasons.append("domain_blocklist")
-
-        mx_ok = await self._has_mx_records(domain)
-        if not mx_ok:
-            score += 0.6
-            reasons.append("mx_missing")
+        with stage("blocklist"):
+            if domain in self._blocklist:
+                score += 0.9
+                reasons.append("domain_blocklist")
+
+        with stage("lookalike"):
+            suggested_domain = self._lookalikes.suggest(domain)
+        if suggested_domain is not None:
+            # Obvious typos of major providers are flagged without a DNS round trip.
+            score += 0.5
+            reasons.append("possible_typo")
         else:
-            reasons.append("mx_ok")
-
-        keyword_match = self._match_keywords(domain, local_part)
-        if keyword_match:
-            score += 0.4
-            reasons.append("keyword_match")
-
-        if self._is_high_entropy(local_part):
-            score += 0.2
-            reasons.append("high_entropy")
+            with stage("mx"):
+                mx_ok = await self._has_mx_records(domain, prefetched_mx)
+            if not mx_ok:
+                score += 0.6
+                reasons.append("mx_missing")
+            else:
+                reasons.append("mx_ok")
+
+        return _DomainCheck(score, tuple(reasons), suggested_domain)
+
+    def _score(self, email: EmailStr | str, canonical: CanonicalEmail, check: _DomainCheck) -> EmailCheckResult:
+        domain = canonical.domain
+        # Heuristics score the address as typed; the canonical form only dedupes.
+        local_part = str(email).split("@", 1)[0].lower()
+        score = check.score
+        reasons = list(check.reasons)
+
+        with stage("heuristics"):
+            keyword_match = self._match_keywords(domain, local_part)
+            if keyword_match:
+                score += 0.4
+                reasons.append("keyword_match")
+
+            if self._is_high_entropy(local_part):
+                score += 0.2
+                reasons.append("high_entropy")
 
         classification = self._classification_from_score(score)
         reasons = reasons or ["no_issue_detected"]
 
         result = EmailCheckResult(
             email=email,
+            canonical_email=canonical.address,
             domain=domain,
             classification=classification,
             score=round(min(score, 1.0), 2),
             reasons=reasons,
+            suggested_domain=check.suggested_domain,
             ttl_seconds=self._settings.cache_ttl_seconds,
         )
         return result
@@ -120,20 +179,22 @@ class EmailDetector:
             return "suspect"
         return "ok"
 
-    def _split_email(self, email: EmailStr) -> Tuple[str, str]:
-        local_part, domain = email.split("@", 1)
-        return local_part.lower(), domain.lower()
-
-    async def _has_mx_records(self, domain: str) -> bool:
+    async def _has_mx_records(self, domain: str, prefetched: Mapping[str, str | None] | None = None) -> bool:
         redis_key = f"mx:{domain}"
-        cached = await self._cache.get(redis_key)
+        if prefetched is not None and domain in prefetched:
+            cached = prefetched[domain]
+        else:
+            cached = await self._cache.get(redis_key)
         if cached is not None:
+            flag("mx-cache", "hit")
             return cached == "1"
 
+        flag("mx-cache", "miss")
         try:
-            answers = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self._resolver.resolve(domain, "MX")
-            )
+            with stage("dns"):
+                answers = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: self._resolver.resolve(domain, "MX")
+                )
             has_records = bool(answers)
         except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as exc:
             logger.debug("MX lookup failed for %s: %s", domain, exc)
@@ -0,0 +1,206 @@
+"""Lookalike/typo domain detection for popular mailbox providers."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Sequence, Set, Tuple
+
+# Ordered by popularity: when a typo is one edit away from several providers,
+# the earlier entry wins.
+POPULAR_PROVIDER_DOMAINS: Tuple[str, ...] = (
+    "gmail.com",
+    "yahoo.com",
+    "hotmail.com",
+    "outlook.com",
+    "icloud.com",
+    "live.com",
+    "aol.com",
+    "msn.com",
+    "googlemail.com",
+    "ymail.com",
+    "me.com",
+    "mac.com",
+    "yahoo.fr",
+    "yahoo.co.uk",
+    "yahoo.de",
+    "yahoo.es",
+    "yahoo.it",
+    "yahoo.ca",
+    "yahoo.gr",
+    "yahoo.fi",
+    "yahoo.se",
+    "yahoo.dk",
+    "yahoo.no",
+    "yahoo.ie",
+    "yahoo.in",
+    "yahoo.co.in",
+    "yahoo.co.jp",
+    "yahoo.com.au",
+    "yahoo.com.br",
+    "yahoo.com.mx",
+    "hotmail.fr",
+    "hotmail.co.uk",
+    "hotmail.de",
+    "hotmail.es",
+    "hotmail.it",
+    "hotmail.be",
+    "hotmail.nl",
+    "outlook.fr",
+    "outlook.de",
+    "outlook.es",
+    "outlook.it",
+    "outlook.be",
+    "live.fr",
+    "live.co.uk",
+    "live.de",
+    "live.it",
+    "live.nl",
+    "live.be",
+    "live.ca",
+    "orange.fr",
+    "wanadoo.fr",
+    "free.fr",
+    "sfr.fr",
+    "laposte.net",
+    "gmx.com",
+    "gmx.de",
+    "gmx.fr",
+    "gmx.net",
+    "gmx.at",
+    "gmx.ch",
+    "web.de",
+    "t-online.de",
+    "libero.it",
+    "protonmail.com",
+    "proton.me",
+    "zoho.com",
+    "yandex.com",
+    "yandex.ru",
+    "mail.ru",
+    "comcast.net",
+    "verizon.net",
+    "att.net",
+)
+
+# Real domains that sit one edit away from a provider (``cloud.com`` and
+# ``icloud.com``) or generic mailbox brands; never flagged and never suggested.
+KNOWN_NON_TYPO_DOMAINS: Tuple[str, ...] = (
+    "mail.com",
+    "email.com",
+    "cloud.com",
+)
+
+
+# Brands that run a mailbox domain on (nearly) every country code: a different
+# ccTLD of the same brand (``yahoo.co.id`` vs ``yahoo.co.in``) is a real domain.
+REGIONAL_PROVIDER_BRANDS: Tuple[str, ...] = (
+    "yahoo",
+    "hotmail",
+    "outlook",
+    "live",
+    "gmx",
+)
+
+_COUNTRY_CODE_TLDS = frozenset(
+    """
+    ac ad ae af ag ai al am ao aq ar as at au aw ax az ba bb bd be bf bg bh bi bj bm bn bo br bs bt bw
+    by bz ca cc cd cf cg ch ci ck cl cm cn co cr cu cv cw cx cy cz de dj dk dm do dz ec ee eg er es et
+    eu fi fj fk fm fo fr ga gb gd ge gf gg gh gi gl gm gn gp gq gr gs gt gu gw gy hk hm hn hr ht hu id
+    ie il im in io iq ir is it je jm jo jp ke kg kh ki km kn kp kr kw ky kz la lb lc li lk lr ls lt lu
+    lv ly ma mc md me mg mh mk ml mm mn mo mp mq mr ms mt mu mv mw mx my mz na nc ne nf ng ni nl no np
+    nr nu nz om pa pe pf pg ph pk pl pm pn pr ps pt pw py qa re ro rs ru rw sa sb sc sd se sg sh si sk
+    sl sm sn so sr ss st su sv sx sy sz tc td tf tg th tj tk tl tm tn to tr tt tv tw tz ua ug uk us uy
+    uz va vc ve vg vi vn vu wf ws ye yt za zm zw
+    """.split()
+)
+_SECOND_LEVEL_LABELS = frozenset(("co", "com", "net", "org", "ne", "or", "ac"))
+
+
+def _is_country_suffix(labels: Sequence[str]) -> bool:
+    """Return True for ``cc`` and ``co.cc``-style public suffixes."""
+
+    if not labels or labels[-1] not in _COUNTRY_CODE_TLDS:
+        return False
+    return len(labels) == 1 or (len(labels) == 2 and labels[0] in _SECOND_LEVEL_LABELS)
+
+
+def _deletes(text: str) -> Set[str]:
+    return {text[:index] + text[index + 1 :] for index in range(len(text))}
+
+
+def _is_single_edit(left: str, right: str) -> bool:
+    """Return True when one insertion, deletion, substitution or adjacent swap separates the strings."""
+
+    if len(left) == len(right):
+        diffs = [index for index, (a, b) in enumerate(zip(left, right)) if a != b]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and left[diffs[0]] == right[diffs[1]]
+            and left[diffs[1]] == right[diffs[0]]
+        )
+    shorter, longer = (left, right) if len(left) < len(right) else (right, left)
+    if len(longer) - len(shorter) != 1:
+        return False
+    index = 0
+    while index < len(shorter) and shorter[index] == longer[index]:
+        index += 1
+    return shorter[index:] == longer[index + 1 :]
+
+
+class LookalikeIndex:
+    """Symmetric-delete index matching domains one edit away from a known provider.
+
+    Every provider domain and its single-character deletions are precomputed at
+    construction, so a lookup is a length check and a set membership test plus
+    at most ``len(domain)`` dict probes, with candidates confirmed by a linear
+    single-edit check. Ties go to the provider listed first in ``domains``.
+
+    Providers and ``known_domains`` themselves never match. Providers whose
+    first label is shorter than ``min_label_length`` (``me.com``, ``gmx.de``)
+    are not indexed because one edit away from them lie too many legitimate
+    domains. Country-code variants of ``regional_brands`` (``hotmail.se``,
+    ``yahoo.com.ar``) are real regional mailboxes and never match either.
+    """
+
+    def __init__(
+        self,
+        domains: Iterable[str] = POPULAR_PROVIDER_DOMAINS,
+        known_domains: Iterable[str] = KNOWN_NON_TYPO_DOMAINS,
+        min_label_length: int = 5,
+        regional_brands: Iterable[str] = REGIONAL_PROVIDER_BRANDS,
+    ) -> None:
+        providers = [domain.lower() for domain in domains]
+        self._rank: Dict[str, int] = {}
+        for rank, domain in enumerate(providers):
+            self._rank.setdefault(domain, rank)
+        self._domains: Set[str] = set(providers) | {domain.lower() for domain in known_domains}
+        self._regional_brands: Set[str] = {brand.lower() for brand in regional_brands}
+        self._index: Dict[str, Set[str]] = {}
+        for domain in self._rank:
+            if len(domain.split(".", 1)[0]) < min_label_length:
+                continue
+            for variant in _deletes(domain) | {domain}:
+                self._index.setdefault(variant, set()).add(domain)
+        lengths = [len(domain) for domain in self._index] or [0]
+        self._min_length = min(lengths)
+        self._max_length = max(lengths) + 1
+
+    def suggest(self, domain: str) -> str | None:
+        """Return the provider ``domain`` most likely mistypes, if any."""
+
+        if domain in self._domains or not self._min_length <= len(domain) <= self._max_length:
+            return None
+        brand, _, suffix = domain.partition(".")
+        if brand in self._regional_brands and _is_country_suffix(suffix.split(".")):
+            return None
+        candidates: Set[str] = set(self._index.get(domain, ()))
+        for position in range(len(domain)):
+            found = self._index.get(domain[:position] + domain[position + 1 :])
+            if found:
+                candidates.update(found)
+        if not candidates:
+            return None
+        matches = [candidate for candidate in candidates if _is_single_edit(domain, candidate)]
+        return min(matches, key=self._rank.__getitem__) if matches else None
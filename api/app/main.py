@@ -8,8 +8,8 @@ from collections import Counter
 from typing import Annotated
 
 import structlog
-from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
-from fastapi.responses import ORJSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from .cache import RedisCache
 from .config import Settings, get_settings
@@ -22,6 +22,10 @@ from .models import (
     EmailCheckResponse,
     HealthResponse,
 )
+from .profiler import SamplingProfiler, render_collapsed
+from .quota import QuotaManager
+from .quota_store import SQLiteQuotaStore
+from .timing import ServerTimingMiddleware, mark_handler_done, stage
 
 logger = structlog.get_logger(__name__)
 
@@ -49,6 +53,10 @@ def get_detector(request: Request) -> EmailDetector:
     return request.app.state.detector
 
 
+def get_quota(request: Request) -> QuotaManager:
+    return request.app.state.quota
+
+
 AuthorizationHeader = Annotated[str | None, Header(convert_underscores=False)]
 
 
@@ -56,14 +64,27 @@ def require_api_key(
     authorization: AuthorizationHeader = None,
     settings: Settings = Depends(get_settings),
 ) -> str:
-    if not settings.api_keys:
-        return "anonymous"
+    with stage("auth"):
+        if not settings.api_keys:
+            return "anonymous"
+
+        if not authorization:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing_authorization_header")
+        token = authorization.replace("Bearer", "").strip()
+        if token not in settings.api_keys:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_api_key")
+        return token
 
+
+def require_admin_key(
+    authorization: AuthorizationHeader = None,
+    settings: Settings = Depends(get_settings),
+) -> str:
     if not authorization:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing_authorization_header")
     token = authorization.replace("Bearer", "").strip()
-    if token not in settings.api_keys:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_api_key")
+    if token not in settings.admin_api_keys:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin_required")
     return token
 
 
@@ -77,9 +98,10 @@ async def enforce_rate_limit(
     if limit <= 0:
         return
     rate_key = f"rate:{api_key}"
-    current = await cache.incr(rate_key)
-    if current == 1:
-        await cache.expire(rate_key, window_seconds)
+    with stage("ratelimit"):
+        current = await cache.incr(rate_key)
+        if current == 1:
+            await cache.expire(rate_key, window_seconds)
     if current > limit:
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="rate_limited")
 
@@ -89,6 +111,9 @@ app = FastAPI(
     version="1.0.0",
     default_response_class=ORJSONResponse,
 )
+app.add_middleware(ServerTimingMiddleware)
+
+_profile_lock = asyncio.Lock()
 
 
 @app.on_event("startup")
@@ -100,6 +125,13 @@ async def on_startup() -> None:
     await detector.startup()
     app.state.cache = cache
     app.state.detector = detector
+    store = SQLiteQuotaStore(settings.quota_store_path) if settings.quota_store_path else None
+    if store is None:
+        logger.warning("emailshield.quota_store_missing", default_monthly_quota=settings.default_monthly_quota)
+    quota = QuotaManager(settings=settings, cache=cache, store=store)
+    await quota.startup()
+    app.state.quota = quota
+    app.state.quota_sync = asyncio.create_task(quota.run())
     if settings.sentry_dsn:
         try:
             import sentry_sdk
@@ -112,6 +144,12 @@ async def on_startup() -> None:
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
+    quota_sync: asyncio.Task[None] | None = getattr(app.state, "quota_sync", None)
+    if quota_sync:
+        quota_sync.cancel()
+    quota: QuotaManager | None = getattr(app.state, "quota", None)
+    if quota:
+        await quota.flush()
     cache: RedisCache | None = getattr(app.state, "cache", None)
     if cache:
         await cache.close()
@@ -128,6 +166,15 @@ async def increment_usage(cache: RedisCache, api_key: str) -> None:
         await cache.expire(usage_key, 86400)
 
 
+async def consume_quota(quota: QuotaManager, api_key: str, units: int) -> None:
+    if api_key == "anonymous":
+        return
+    with stage("quota"):
+        allowed = await quota.consume(api_key, units)
+    if not allowed:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="quota_exceeded")
+
+
 @app.post(
     "/v1/check-email",
     response_model=EmailCheckResponse,
@@ -138,9 +185,14 @@ async def check_email(
     api_key: str = Depends(require_api_key),
     detector: EmailDetector = Depends(get_detector),
     cache: RedisCache = Depends(get_cache),
+    quota: QuotaManager = Depends(get_quota),
 ) -> EmailCheckResponse:
-    result = await detector.classify(payload)
-    await increment_usage(cache, api_key)
+    await consume_quota(quota, api_key, 1)
+    with stage("classify"):
+        result = await detector.classify(payload)
+    with stage("usage"):
+        await increment_usage(cache, api_key)
+    mark_handler_done()
     return EmailCheckResponse(**result.dict())
 
 
@@ -155,14 +207,16 @@ async def check_bulk(
     detector: EmailDetector = Depends(get_detector),
     settings: Settings = Depends(get_settings),
     cache: RedisCache = Depends(get_cache),
+    quota: QuotaManager = Depends(get_quota),
 ) -> BulkCheckResponse:
     if len(payload.emails) > settings.max_bulk_batch:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"batch size exceeds {settings.max_bulk_batch}",
         )
-    tasks = [detector.classify(request) for request in payload.emails]
-    results = await asyncio.gather(*tasks)
+    await consume_quota(quota, api_key, len(payload.emails))
+    with stage("classify"):
+        results = await detector.classify_many(payload.emails)
 
     metrics_counter = Counter(result.classification for result in results)
     metrics = BulkMetrics(
@@ -170,14 +224,42 @@ async def check_bulk(
         ok=metrics_counter.get("ok", 0),
         suspect=metrics_counter.get("suspect", 0),
         disposable=metrics_counter.get("disposable", 0),
+        duplicates=len(results) - len({result.canonical_email for result in results}),
     )
-    await increment_usage(cache, api_key)
+    with stage("usage"):
+        await increment_usage(cache, api_key)
+    mark_handler_done()
     return BulkCheckResponse(
         results=[EmailCheckResponse(**result.dict()) for result in results],
         metrics=metrics,
     )
 
 
+@app.get(
+    "/v1/admin/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin_key)],
+    include_in_schema=False,
+)
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    settings: Settings = Depends(get_settings),
+) -> PlainTextResponse:
+    if seconds > settings.profile_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"profile duration exceeds {settings.profile_max_seconds}",
+        )
+    if _profile_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="profile_in_progress")
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval_seconds=interval_ms / 1000)
+        samples = await asyncio.get_event_loop().run_in_executor(None, profiler.run, seconds)
+    logger.info("emailshield.profile_captured", seconds=seconds, samples=sum(samples.values()))
+    return PlainTextResponse(render_collapsed(samples))
+
+
 @app.get("/health", response_model=HealthResponse, include_in_schema=False)
 async def health(settings: Settings = Depends(get_settings)) -> HealthResponse:
     return HealthResponse(status="ok", region=settings.region_hint)
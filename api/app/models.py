@@ -18,10 +18,12 @@ class EmailCheckRequest(BaseModel):
 
 class EmailCheckResult(BaseModel):
     email: EmailStr
+    canonical_email: Optional[str] = None
     domain: str
     classification: Classification
     score: float = Field(ge=0.0, le=1.0)
     reasons: List[str]
+    suggested_domain: Optional[str] = None
     ttl_seconds: int = 0
     checked_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     version: str = "v1"
@@ -47,6 +49,7 @@ class BulkMetrics(BaseModel):
     ok: int
     suspect: int
     disposable: int
+    duplicates: int = 0
 
 
 class BulkCheckResponse(BaseModel):
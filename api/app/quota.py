@@ -0,0 +1,259 @@
+"""Monthly quota enforcement backed by locally leased allowances."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+
+from .cache import RedisCache
+from .config import Settings
+from .quota_store import QuotaAccount, QuotaStore, hash_api_key
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_TTL_SECONDS = 35 * 86400
+_EXHAUSTED_BACKOFF_SECONDS = 1.0
+_LEASES_KEY = "quota:leases"
+
+
+@dataclass
+class _Lease:
+    period: str
+    remaining: int = 0
+    exhausted_at: float | None = None
+    touched: bool = False
+
+
+def _current_period() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m")
+
+
+class QuotaManager:
+    """Enforces per-key monthly quotas without a remote call on every request.
+
+    Each worker reserves allowances of ``quota_lease_size`` units from a shared
+    Redis counter and decrements them in process, so only one request per lease
+    touches Redis. Keys known to the :class:`QuotaStore` share their account's
+    counter (``quota:used:acct:{id}:{YYYYMM}``), seeded from
+    ``accounts.quota_used`` whenever it is missing, and its
+    ``monthly_quota``; other keys use ``quota:used:{apikey}:{YYYYMM}``,
+    ``quota:limit:{apikey}`` or ``default_monthly_quota``. A limit ``<= 0``
+    means unlimited.
+
+    Over-reservations are handed straight back, so the allowances granted
+    across all workers never exceed the quota. Leases are recorded in the
+    ``quota:leases`` hash when reserved, and :meth:`sync` runs every
+    ``quota_sync_interval_seconds`` to batch consumed units into the store,
+    return idle leases and reclaim leases held by workers that stopped
+    heartbeating.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        cache: RedisCache,
+        store: QuotaStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._settings = settings
+        self._cache = cache
+        self._store = store
+        self._clock = clock
+        self._worker_id = uuid.uuid4().hex
+        self._leases: Dict[str, _Lease] = {}
+        self._limits: Dict[str, Tuple[int, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._accounts: Dict[str, QuotaAccount] = {}
+        self._consumed: Counter[str] = Counter()
+        self._published: set[str] = set()
+
+    async def consume(self, api_key: str, units: int = 1) -> bool:
+        """Consume ``units`` from the key's monthly quota, returning False when exhausted."""
+
+        allowed = await self._consume(api_key, units)
+        if allowed:
+            self._consumed[api_key] += units
+        return allowed
+
+    async def _consume(self, api_key: str, units: int) -> bool:
+        period = _current_period()
+        lease = self._leases.get(api_key)
+        if lease is not None and lease.period == period and lease.remaining >= units:
+            lease.remaining -= units
+            lease.touched = True
+            return True
+
+        lock = self._locks.setdefault(api_key, asyncio.Lock())
+        async with lock:
+            lease = self._leases.get(api_key)
+            if lease is None or lease.period != period:
+                lease = _Lease(period=period)
+                self._leases[api_key] = lease
+            lease.touched = True
+            granted = 0
+            if lease.remaining < units:
+                limit = await self._limit_for(api_key)
+                if limit <= 0:
+                    return True
+                if lease.exhausted_at is not None and self._clock() - lease.exhausted_at < _EXHAUSTED_BACKOFF_SECONDS:
+                    return False
+                wanted = max(self._settings.quota_lease_size, units - lease.remaining)
+                granted = await self._reserve(api_key, period, limit, wanted)
+                lease.remaining += granted
+                lease.exhausted_at = self._clock() if granted < wanted else None
+            allowed = lease.remaining >= units
+            if allowed:
+                lease.remaining -= units
+            if granted:
+                field = self._lease_field(api_key, period)
+                await self._cache.hset(_LEASES_KEY, {field: lease.remaining})
+                self._published.add(field)
+            return allowed
+
+    async def startup(self) -> None:
+        """Load limits from the store and start heartbeating before serving traffic."""
+
+        await self._sync_store()
+        await self._heartbeat()
+
+    async def run(self) -> None:
+        """Run :meth:`sync` forever; meant to be started as a background task."""
+
+        while True:
+            await asyncio.sleep(self._settings.quota_sync_interval_seconds)
+            try:
+                await self.sync()
+            except Exception:  # pragma: no cover - keep the loop alive
+                logger.exception("quota sync failed")
+
+    async def sync(self) -> None:
+        """Reconcile local state with the store and the shared Redis counters."""
+
+        # Heartbeat first: a slow or failing store must never make a live worker
+        # look dead to the others, or they would refund leases it still serves.
+        await self._heartbeat()
+        try:
+            await self._sync_store()
+        except Exception:
+            logger.exception("quota store sync failed")
+        await self._return_leases(idle_only=True)
+        await self._publish_leases()
+        await self._reclaim_dead_leases()
+
+    async def flush(self) -> None:
+        """Return every unused lease and write pending usage (graceful shutdown)."""
+
+        await self._return_leases(idle_only=False)
+        await self._publish_leases()
+        await self._sync_store()
+
+    async def _sync_store(self) -> None:
+        if self._store is None:
+            return
+        consumed, self._consumed = self._consumed, Counter()
+        usage = Counter({hash_api_key(api_key): units for api_key, units in consumed.items()})
+        loop = asyncio.get_event_loop()
+        try:
+            if usage:
+                await loop.run_in_executor(None, self._store.add_usage, usage)
+            self._accounts = await loop.run_in_executor(None, self._store.load_accounts)
+        except Exception:
+            self._consumed.update(consumed)
+            raise
+        self._limits.clear()
+
+    async def _return_leases(self, idle_only: bool) -> None:
+        returned: Dict[str, int] = {}
+        for api_key, lease in self._leases.items():
+            if lease.remaining and not (idle_only and lease.touched):
+                returned[self._used_key(api_key, lease.period)] = -lease.remaining
+                lease.remaining = 0
+            lease.touched = False
+        if returned:
+            await self._cache.incrby_many(returned)
+
+    async def _publish_leases(self) -> None:
+        """Record outstanding leases so other workers can reclaim them if this one dies."""
+
+        held = {
+            self._lease_field(api_key, lease.period): lease.remaining
+            for api_key, lease in self._leases.items()
+            if lease.remaining
+        }
+        released = self._published - held.keys()
+        if held:
+            await self._cache.hset(_LEASES_KEY, held)
+        if released:
+            await self._cache.hdel(_LEASES_KEY, *released)
+        self._published = set(held)
+        await self._heartbeat()
+
+    async def _heartbeat(self) -> None:
+        heartbeat_ttl = max(1, int(self._settings.quota_sync_interval_seconds * 3))
+        await self._cache.set(self._heartbeat_key(self._worker_id), "1", ttl=heartbeat_ttl)
+
+    async def _reclaim_dead_leases(self) -> None:
+        leases = await self._cache.hgetall(_LEASES_KEY)
+        workers = list({field.split("|", 1)[0] for field in leases} - {self._worker_id})
+        if not workers:
+            return
+        heartbeats = await self._cache.mget([self._heartbeat_key(worker) for worker in workers])
+        dead = {worker for worker, heartbeat in zip(workers, heartbeats) if heartbeat is None}
+        # Refunds use the last published snapshot, so units a dead worker consumed
+        # after it are handed out again (at most one lease per key).
+        refunds: Counter[str] = Counter()
+        for field, remaining in leases.items():
+            worker, used_key = field.split("|", 1)
+            # HDEL succeeds for exactly one reclaiming worker, so each lease is refunded once.
+            if worker in dead and await self._cache.hdel(_LEASES_KEY, field):
+                refunds[used_key] -= int(remaining)
+        if refunds:
+            logger.info("reclaimed quota leases from %d dead workers", len(dead))
+            await self._cache.incrby_many(refunds)
+
+    async def _limit_for(self, api_key: str) -> int:
+        now = self._clock()
+        cached = self._limits.get(api_key)
+        if cached is not None and now - cached[1] < self._settings.quota_limit_refresh_seconds:
+            return cached[0]
+        account = self._accounts.get(hash_api_key(api_key))
+        if account is not None:
+            limit = account.monthly_quota
+        else:
+            raw = await self._cache.get(f"quota:limit:{api_key}")
+            limit = int(raw) if raw is not None else self._settings.default_monthly_quota
+        self._limits[api_key] = (limit, now)
+        return limit
+
+    async def _reserve(self, api_key: str, period: str, limit: int, amount: int) -> int:
+        used_key = self._used_key(api_key, period)
+        account = self._accounts.get(hash_api_key(api_key))
+        if account is not None and account.quota_used:
+            # Restores the month's usage if the counter was lost (flush, node added).
+            await self._cache.set(used_key, account.quota_used, ttl=_PERIOD_TTL_SECONDS, nx=True)
+        total = await self._cache.incrby(used_key, amount)
+        if total == amount:
+            await self._cache.expire(used_key, _PERIOD_TTL_SECONDS)
+        excess = min(amount, max(0, total - limit))
+        if excess:
+            await self._cache.decrby(used_key, excess)
+        return amount - excess
+
+    def _used_key(self, api_key: str, period: str) -> str:
+        account = self._accounts.get(hash_api_key(api_key)) if self._accounts else None
+        if account is not None:
+            return f"quota:used:acct:{account.account_id}:{period}"
+        return f"quota:used:{api_key}:{period}"
+
+    def _lease_field(self, api_key: str, period: str) -> str:
+        return f"{self._worker_id}|{self._used_key(api_key, period)}"
+
+    @staticmethod
+    def _heartbeat_key(worker_id: str) -> str:
+        return f"quota:worker:{worker_id}"
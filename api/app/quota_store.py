@@ -0,0 +1,95 @@
+"""Account quota stores used to load limits and record consumption in batches."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Mapping, Protocol
+
+
+@lru_cache(maxsize=4096)
+def hash_api_key(api_key: str) -> str:
+    """Hash a key the way the dashboard stores it in ``api_keys.hashed_secret``."""
+
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class QuotaStore(Protocol):
+    """Source of truth for ``accounts.monthly_quota`` and ``accounts.quota_used``.
+
+    Methods are blocking and are called from an executor by ``QuotaManager``,
+    never on the request path. Keys are identified by their hashed secret.
+    """
+
+    def load_accounts(self) -> Dict[str, "QuotaAccount"]:
+        """Return the owning account of every active key."""
+
+    def add_usage(self, usage: Mapping[str, int]) -> None:
+        """Add consumed units to ``quota_used`` of each key's account."""
+
+
+@dataclass(frozen=True)
+class QuotaAccount:
+    account_id: str
+    monthly_quota: int
+    quota_used: int
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id TEXT PRIMARY KEY,
+    plan TEXT NOT NULL DEFAULT 'free',
+    monthly_quota INTEGER NOT NULL DEFAULT 25000,
+    quota_used INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS api_keys (
+    id TEXT PRIMARY KEY,
+    owner_id TEXT NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    hashed_secret TEXT NOT NULL UNIQUE,
+    revoked_at TEXT
+);
+"""
+
+
+class SQLiteQuotaStore:
+    """Local stand-in for the Postgres ``accounts``/``api_keys`` tables.
+
+    Mirrors the columns of ``db/schema.sql`` that quota enforcement needs, so
+    single-node deployments and tests can run without Postgres.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SQLITE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path)
+
+    def load_accounts(self) -> Dict[str, QuotaAccount]:
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT k.hashed_secret, a.id, a.monthly_quota, a.quota_used
+                FROM api_keys k JOIN accounts a ON a.id = k.owner_id
+                WHERE k.revoked_at IS NULL
+                """
+            ).fetchall()
+        return {
+            hashed_secret: QuotaAccount(str(account_id), int(monthly_quota), int(quota_used))
+            for hashed_secret, account_id, monthly_quota, quota_used in rows
+        }
+
+    def add_usage(self, usage: Mapping[str, int]) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                """
+                UPDATE accounts SET quota_used = quota_used + ?
+                WHERE id = (SELECT owner_id FROM api_keys WHERE hashed_secret = ?)
+                """,
+                [(units, hashed_secret) for hashed_secret, units in usage.items()],
+            )
@@ -0,0 +1,126 @@
+"""Opt-in Server-Timing instrumentation for debug API keys."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import ContextManager, Dict, Iterator
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import get_settings
+
+_current_timing: ContextVar["ServerTiming | None"] = ContextVar("emailshield_server_timing", default=None)
+_NOOP = nullcontext()
+
+
+class ServerTiming:
+    """Collects per-stage durations and flags for a single request.
+
+    Durations recorded under the same name are summed, so bulk requests report
+    the total time spent per stage across all items.
+    """
+
+    def __init__(self) -> None:
+        self._durations: Dict[str, float] = {}
+        self._flags: Dict[str, Counter[str]] = {}
+        self.handler_done_at: float | None = None
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self._durations[name] = self._durations.get(name, 0.0) + duration_ms
+
+    def flag(self, name: str, value: str) -> None:
+        self._flags.setdefault(name, Counter())[value] += 1
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def header_value(self) -> str:
+        parts = [f"{name};dur={duration:.3f}" for name, duration in self._durations.items()]
+        for name, values in self._flags.items():
+            if sum(values.values()) == 1:
+                description = next(iter(values))
+            else:
+                description = ",".join(f"{value}:{count}" for value, count in values.items())
+            parts.append(f'{name};desc="{description}"')
+        return ", ".join(parts)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time a block when debug timing is active; a shared no-op otherwise."""
+
+    timing = _current_timing.get()
+    if timing is None:
+        return _NOOP
+    return timing.measure(name)
+
+
+def mark_handler_done() -> None:
+    """Note that the endpoint is about to return, so the middleware can time serialization."""
+
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.handler_done_at = time.perf_counter()
+
+
+def flag(name: str, value: str) -> None:
+    """Attach a flag (e.g. cache hit/miss) when debug timing is active."""
+
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.flag(name, value)
+
+
+def _bearer_token(scope: Scope) -> str | None:
+    for key, value in scope["headers"]:
+        if key == b"authorization":
+            return value.decode("latin-1").replace("Bearer", "").strip()
+    return None
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding a ``Server-Timing`` header for debug API keys.
+
+    Requests from other keys are passed straight through without allocating a
+    collector, so instrumentation points reduce to a context variable lookup.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        debug_keys = get_settings().debug_api_keys
+        if not debug_keys or _bearer_token(scope) not in debug_keys:
+            await self.app(scope, receive, send)
+            return
+
+        timing = ServerTiming()
+        token = _current_timing.set(timing)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                if timing.handler_done_at is not None:
+                    # Response model building, validation and JSON rendering.
+                    timing.record("serialize", (now - timing.handler_done_at) * 1000)
+                timing.record("total", (now - start) * 1000)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.header_value())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timing.reset(token)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, List, Optional, Set
 
 import httpx
 
@@ -18,6 +19,20 @@ class EmailShieldResult:
     score: float
     reasons: List[str]
     ttl_seconds: int
+    suggested_domain: Optional[str] = None
+    canonical_email: Optional[str] = None
+
+
+def _parse_result(data: dict[str, Any]) -> EmailShieldResult:
+    return EmailShieldResult(
+        email=data["email"],
+        classification=data["classification"],
+        score=data["score"],
+        reasons=list(data.get("reasons", [])),
+        ttl_seconds=data.get("ttl_seconds", 0),
+        suggested_domain=data.get("suggested_domain"),
+        canonical_email=data.get("canonical_email"),
+    )
 
 
 class EmailShieldClient:
@@ -48,14 +63,7 @@ class EmailShieldClient:
                 headers=self._headers(),
             )
             response.raise_for_status()
-            data = response.json()
-            return EmailShieldResult(
-                email=data["email"],
-                classification=data["classification"],
-                score=data["score"],
-                reasons=list(data.get("reasons", [])),
-                ttl_seconds=data.get("ttl_seconds", 0),
-            )
+            return _parse_result(response.json())
 
     def check_bulk(self, emails: Iterable[str]) -> List[EmailShieldResult]:
         payload = {
@@ -68,17 +76,169 @@ class EmailShieldClient:
                 headers=self._headers(),
             )
             response.raise_for_status()
-            data = response.json()
-            return [
-                EmailShieldResult(
-                    email=item["email"],
-                    classification=item["classification"],
-                    score=item["score"],
-                    reasons=list(item.get("reasons", [])),
-                    ttl_seconds=item.get("ttl_seconds", 0),
-                )
-                for item in data["results"]
-            ]
-
-
-__all__ = ["EmailShieldClient", "EmailShieldResult"]
+            return [_parse_result(item) for item in response.json()["results"]]
+
+
+@dataclass
+class _PendingCheck:
+    email: str
+    future: asyncio.Future[EmailShieldResult]
+
+
+class AsyncEmailShieldClient:
+    """Async HTTP client for EmailShield with optional micro-batching.
+
+    With ``batching=True``, concurrent :meth:`check_email` calls made within
+    ``batch_window`` seconds (or until ``max_batch_size`` calls are queued) are
+    sent as a single ``/v1/check-bulk`` request and each caller receives its
+    own result. If the server rejects a batch as invalid, only the callers
+    whose addresses it names receive the error and the rest are resent
+    together as one ``/v1/check-bulk`` request.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 5.0,
+        batching: bool = False,
+        batch_window: float = 0.005,
+        max_batch_size: int = 100,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.batching = batching
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._client = httpx.AsyncClient(timeout=timeout, transport=transport)
+        self._pending: List[_PendingCheck] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task[None]] = set()
+
+    async def __aenter__(self) -> "AsyncEmailShieldClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def _headers(self) -> dict[str, str]:
+        if self.api_key:
+            return {"Authorization": f"Bearer {self.api_key}"}
+        return {}
+
+    async def check_email(self, email: str) -> EmailShieldResult:
+        if not self.batching:
+            return await self._check_single(email)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[EmailShieldResult] = loop.create_future()
+        self._pending.append(_PendingCheck(email=email, future=future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def check_bulk(self, emails: Iterable[str]) -> List[EmailShieldResult]:
+        payload = {
+            "emails": [{"email": email} for email in emails],
+        }
+        response = await self._client.post(
+            f"{self.base_url}/v1/check-bulk",
+            json=payload,
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        return [_parse_result(item) for item in response.json()["results"]]
+
+    async def aclose(self) -> None:
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self._client.aclose()
+
+    async def _check_single(self, email: str) -> EmailShieldResult:
+        response = await self._client.post(
+            f"{self.base_url}/v1/check-email",
+            json={"email": email},
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        return _parse_result(response.json())
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send_batch(self, batch: List[_PendingCheck]) -> None:
+        if len(batch) == 1:
+            await self._resolve_single(batch[0])
+            return
+        try:
+            results = await self.check_bulk(pending.email for pending in batch)
+        except httpx.HTTPStatusError as exc:
+            rejected = _rejected_indices(exc.response) if exc.response.status_code == 422 else set()
+            rejected &= set(range(len(batch)))
+            if rejected and len(rejected) < len(batch):
+                for index in rejected:
+                    _set_exception(batch[index].future, exc)
+                await self._send_batch([pending for index, pending in enumerate(batch) if index not in rejected])
+                return
+            for pending in batch:
+                _set_exception(pending.future, exc)
+            return
+        except httpx.HTTPError as exc:
+            for pending in batch:
+                _set_exception(pending.future, exc)
+            return
+        if len(results) != len(batch):
+            error = RuntimeError(f"check-bulk returned {len(results)} results for {len(batch)} emails")
+            for pending in batch:
+                _set_exception(pending.future, error)
+            return
+        for pending, result in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def _resolve_single(self, pending: _PendingCheck) -> None:
+        try:
+            result = await self._check_single(pending.email)
+        except httpx.HTTPError as exc:
+            _set_exception(pending.future, exc)
+        else:
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+
+def _rejected_indices(response: httpx.Response) -> Set[int]:
+    """Positions of ``emails`` items named in a 422 ``detail[*].loc`` (``["body", "emails", i, ...]``)."""
+
+    try:
+        detail = response.json().get("detail")
+    except ValueError:
+        return set()
+    if not isinstance(detail, list):
+        return set()
+    indices: Set[int] = set()
+    for error in detail:
+        loc = error.get("loc") if isinstance(error, dict) else None
+        if isinstance(loc, list) and len(loc) >= 3 and loc[:2] == ["body", "emails"] and isinstance(loc[2], int):
+            indices.add(loc[2])
+    return indices
+
+
+def _set_exception(future: asyncio.Future[EmailShieldResult], exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+__all__ = ["AsyncEmailShieldClient", "EmailShieldClient", "EmailShieldResult"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 
 import pytest
 import pytest_asyncio
@@ -21,14 +21,42 @@ class FakeRedisCache:
             return value
         return str(value)
 
-    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:  # noqa: ARG002
+    async def set(self, key: str, value: Any, ttl: int | None = None, nx: bool = False) -> None:  # noqa: ARG002
+        if nx and key in self.store:
+            return
         self.store[key] = value
+        self.counters.pop(key, None)
 
     async def incr(self, key: str) -> int:
-        self.counters[key] += 1
+        return await self.incrby(key, 1)
+
+    async def incrby(self, key: str, amount: int) -> int:
+        if key not in self.counters and key in self.store:
+            self.counters[key] = int(self.store[key])
+        self.counters[key] += amount
         self.store[key] = str(self.counters[key])
         return self.counters[key]
 
+    async def decrby(self, key: str, amount: int) -> int:
+        return await self.incrby(key, -amount)
+
+    async def hset(self, key: str, mapping: Dict[str, Any]) -> None:
+        self.store.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        hash_value = self.store.get(key, {})
+        return sum(1 for field in fields if hash_value.pop(field, None) is not None)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self.store.get(key, {}))
+
+    async def mget(self, keys: Sequence[str]) -> List[str | None]:
+        return [await self.get(key) for key in keys]
+
+    async def incrby_many(self, amounts: Dict[str, int]) -> None:
+        for key, amount in amounts.items():
+            await self.incrby(key, amount)
+
     async def expire(self, key: str, ttl: int) -> None:  # noqa: ARG002
         return
 
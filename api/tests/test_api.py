@@ -35,3 +35,86 @@ def test_health_endpoint(client):
 def test_unauthorized_request(client):
     response = client.post("/v1/check-email", json={"email": "user@example.com"})
     assert response.status_code == 401
+
+
+def test_server_timing_header_for_debug_key(client, monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("DEBUG_API_KEYS", "sk_test")
+    get_settings.cache_clear()
+    client.app.state.cache.store["mx:example.com"] = "1"
+    response = client.post(
+        "/v1/check-email",
+        json={"email": "user@example.com"},
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200, response.text
+    server_timing = response.headers["server-timing"]
+    for name in ("auth;", "ratelimit;", "classify;", "mx;", "serialize;", "total;"):
+        assert name in server_timing
+    assert 'mx-cache;desc="hit"' in server_timing
+
+
+def test_server_timing_absent_without_debug_key(client):
+    client.app.state.cache.store["mx:example.com"] = "1"
+    response = client.post(
+        "/v1/check-email",
+        json={"email": "user@example.com"},
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_admin_profile_requires_admin_key(client):
+    response = client.get("/v1/admin/profile", params={"seconds": 0.01}, headers=auth_headers())
+    assert response.status_code == 403
+    assert response.json()["detail"] == "admin_required"
+
+
+def test_admin_profile_returns_collapsed_stacks(client, monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("ADMIN_API_KEYS", "sk_admin")
+    get_settings.cache_clear()
+    response = client.get(
+        "/v1/admin/profile",
+        params={"seconds": 0.05, "interval_ms": 1},
+        headers={"Authorization": "Bearer sk_admin"},
+    )
+    assert response.status_code == 200, response.text
+    lines = response.text.strip().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) >= 1
+
+
+def test_monthly_quota_exceeded(client):
+    client.app.state.cache.store["mx:example.com"] = "1"
+    client.app.state.cache.store["quota:limit:sk_test"] = "1"
+    first = client.post("/v1/check-email", json={"email": "user@example.com"}, headers=auth_headers())
+    second = client.post("/v1/check-email", json={"email": "user@example.com"}, headers=auth_headers())
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.json()["detail"] == "quota_exceeded"
+
+
+def test_check_bulk_groups_canonical_duplicates(client):
+    client.app.state.cache.store["mx:gmail.com"] = "1"
+    emails = ["john.doe+promo@gmail.com", "johndoe@googlemail.com", "jane@gmail.com"]
+    response = client.post(
+        "/v1/check-bulk",
+        json={"emails": [{"email": email} for email in emails]},
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item["email"] for item in body["results"]] == emails
+    assert [item["canonical_email"] for item in body["results"]] == [
+        "johndoe@gmail.com",
+        "johndoe@gmail.com",
+        "jane@gmail.com",
+    ]
+    assert body["metrics"]["total"] == 3
+    assert body["metrics"]["duplicates"] == 1
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, List
+
+import pytest
+
+from app.cache import HashRing, RedisCache, node_id
+
+
+class FakeRedisNode:
+    """Minimal stand-in for one ``redis.asyncio.Redis`` node."""
+
+    def __init__(self) -> None:
+        self.store: Dict[str, Any] = {}
+        self.calls: List[str] = []
+
+    async def get(self, key: str) -> Any:
+        self.calls.append("get")
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None, nx: bool = False) -> None:  # noqa: ARG002
+        self.calls.append("set")
+        if not (nx and key in self.store):
+            self.store[key] = value
+
+    async def mget(self, keys: List[str]) -> List[Any]:
+        self.calls.append("mget")
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":  # noqa: ARG002
+        self.calls.append("pipeline")
+        return FakePipeline(self)
+
+    async def close(self) -> None:
+        return
+
+
+class FakePipeline:
+    def __init__(self, node: FakeRedisNode) -> None:
+        self._node = node
+        self._ops: List[tuple[str, int]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return
+
+    def incrby(self, key: str, amount: int) -> "FakePipeline":
+        self._ops.append((key, amount))
+        return self
+
+    async def execute(self) -> List[int]:
+        results = []
+        for key, amount in self._ops:
+            self._node.store[key] = int(self._node.store.get(key, 0)) + amount
+            results.append(self._node.store[key])
+        return results
+
+
+@pytest.fixture()
+def nodes() -> Dict[str, FakeRedisNode]:
+    return {f"redis://node{i}:6379/0": FakeRedisNode() for i in range(3)}
+
+
+def test_hash_ring_spreads_keys_evenly():
+    ring = HashRing(["a", "b", "c"])
+    counts = Counter(ring.node_for(f"mx:domain{i}.com") for i in range(30000))
+    assert set(counts) == {"a", "b", "c"}
+    assert all(8000 < count < 12000 for count in counts.values())
+
+
+def test_adding_node_remaps_small_fraction():
+    keys = [f"rate:sk_{i}" for i in range(20000)]
+    before = HashRing(["a", "b", "c", "d"])
+    after = HashRing(["a", "b", "c", "d", "e"])
+    moved = [key for key in keys if before.node_for(key) != after.node_for(key)]
+    assert 0.1 < len(moved) / len(keys) < 0.3
+    assert all(after.node_for(key) == "e" for key in moved)
+
+
+@pytest.mark.asyncio()
+async def test_keys_routed_to_single_shard(settings, nodes):
+    cache = RedisCache(settings, clients=nodes)
+
+    await cache.set("mx:example.com", "1")
+
+    holders = [node for node in nodes.values() if "mx:example.com" in node.store]
+    assert holders == [cache.client_for("mx:example.com")]
+    assert await cache.get("mx:example.com") == "1"
+
+
+@pytest.mark.asyncio()
+async def test_mget_and_incrby_many_split_per_shard(settings, nodes):
+    cache = RedisCache(settings, clients=nodes)
+    keys = [f"mx:domain{i}.com" for i in range(30)]
+    for index, key in enumerate(keys):
+        await cache.set(key, str(index))
+
+    assert await cache.mget(keys + ["mx:missing.com"]) == [str(index) for index in range(30)] + [None]
+    assert all(node.calls.count("mget") == 1 for node in nodes.values())
+
+    await cache.incrby_many({key: 5 for key in keys})
+    assert all(node.calls.count("pipeline") == 1 for node in nodes.values())
+    assert [int(cache.client_for(key).store[key]) for key in keys] == [index + 5 for index in range(30)]
+
+
+def test_node_id_ignores_credentials_scheme_and_db():
+    assert node_id("redis://:old@cache-1:6379/0") == node_id("rediss://:new@cache-1:6379/2") == "cache-1:6379"
+    assert node_id("redis://cache-2") == "cache-2:6379"
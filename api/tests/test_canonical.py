@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from app.canonical import canonicalize
+
+
+@pytest.mark.parametrize(
+    "email",
+    ["john.doe+promo@gmail.com", "johndoe@googlemail.com", "JohnDoe+x@gmail.com", "J.o.h.n.D.o.e@GMail.com"],
+)
+def test_gmail_variants_share_canonical_address(email):
+    assert canonicalize(email).address == "johndoe@gmail.com"
+
+
+def test_plus_tag_stripped_for_known_provider():
+    assert canonicalize("Jane+news@Outlook.com").address == "jane@outlook.com"
+
+
+def test_unknown_provider_only_lowercased():
+    canonical = canonicalize("John.Doe+promo@Example.com")
+    assert canonical.local_part == "john.doe+promo"
+    assert canonical.domain == "example.com"
+
+
+def test_empty_mailbox_keeps_original_local_part():
+    assert canonicalize("+tag@gmail.com").address == "+tag@gmail.com"
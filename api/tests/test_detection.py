@@ -40,3 +40,35 @@ async def test_keyword_marks_suspect(detector_and_cache):
     assert result.score >= 0.4
     assert result.classification in {"suspect", "disposable"}
     assert "keyword_match" in result.reasons
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("email", ["john+temp@gmail.com", "john+trash@outlook.com"])
+async def test_plus_tag_keywords_scored_before_canonicalization(detector_and_cache, email):
+    detector, cache = detector_and_cache
+    cache.store["mx:gmail.com"] = "1"
+    cache.store["mx:outlook.com"] = "1"
+
+    result = await detector.classify(EmailCheckRequest(email=email))
+    tagged, plain = await detector.classify_many(
+        [EmailCheckRequest(email=email), EmailCheckRequest(email=email.replace("+temp", "").replace("+trash", ""))]
+    )
+
+    assert result.classification == "suspect"
+    assert "keyword_match" in result.reasons
+    assert (tagged.classification, tagged.reasons) == (result.classification, result.reasons)
+    assert plain.classification == "ok"
+    assert plain.canonical_email == tagged.canonical_email
+
+
+@pytest.mark.asyncio()
+async def test_typo_domain_flagged_without_mx_lookup(detector_and_cache):
+    detector, cache = detector_and_cache
+
+    request = EmailCheckRequest(email="jane@gmial.com")
+    result = await detector.classify(request)
+
+    assert result.classification == "suspect"
+    assert "possible_typo" in result.reasons
+    assert result.suggested_domain == "gmail.com"
+    assert "mx:gmial.com" not in cache.store
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from app.lookalike import LookalikeIndex
+
+
+@pytest.mark.parametrize(
+    ("domain", "expected"),
+    [
+        ("gmial.com", "gmail.com"),
+        ("hotmial.com", "hotmail.com"),
+        ("outlok.fr", "outlook.fr"),
+        ("gmail.co", "gmail.com"),
+        ("yahooo.com", "yahoo.com"),
+        ("hmail.com", "gmail.com"),
+        ("zmail.com", "gmail.com"),
+    ],
+)
+def test_typo_suggests_provider(domain, expected):
+    assert LookalikeIndex().suggest(domain) == expected
+
+
+@pytest.mark.parametrize(
+    "domain",
+    ["gmail.com", "email.com", "example.com", "gmx.fr", "mail.example-company.io", "cloud.com", "yahoo.gr", "yahoo.fi"],
+)
+def test_known_or_unrelated_domain_not_flagged(domain):
+    assert LookalikeIndex().suggest(domain) is None
+
+
+@pytest.mark.parametrize(
+    "domain",
+    [
+        "yahoo.co.id",
+        "yahoo.com.ar",
+        "yahoo.com.my",
+        "yahoo.cn",
+        "yahoo.ch",
+        "yahoo.cz",
+        "yahoo.be",
+        "yahoo.nl",
+        "yahoo.at",
+        "hotmail.se",
+        "hotmail.dk",
+        "hotmail.no",
+        "hotmail.fi",
+        "outlook.at",
+        "outlook.pt",
+        "outlook.ie",
+        "outlook.dk",
+        "outlook.kr",
+    ],
+)
+def test_regional_provider_domain_not_flagged(domain):
+    assert LookalikeIndex().suggest(domain) is None
+
+
+@pytest.mark.parametrize(
+    ("domain", "expected"),
+    [("yahoo.con", "yahoo.com"), ("hotmail.co.ukk", "hotmail.co.uk"), ("yahooo.de", "yahoo.de"), ("outlok.it", "outlook.it")],
+)
+def test_regional_brand_typos_still_flagged(domain, expected):
+    assert LookalikeIndex().suggest(domain) == expected
+
+
+def test_short_provider_labels_not_indexed():
+    index = LookalikeIndex(["me.com", "gmail.com"])
+    assert index.suggest("mo.com") is None
+    assert index.suggest("gmaill.com") == "gmail.com"
+
+
+def test_ties_broken_by_provider_rank():
+    assert LookalikeIndex(["yahoo.fr", "yahoo.de"]).suggest("yahoo.fe") == "yahoo.fr"
+    assert LookalikeIndex(["yahoo.de", "yahoo.fr"]).suggest("yahoo.fe") == "yahoo.de"
+
+
+def test_known_domains_not_indexed():
+    index = LookalikeIndex(["gmail.com"], known_domains=["email.com"])
+    assert index.suggest("email.com") is None
+    assert index.suggest("emial.com") is None
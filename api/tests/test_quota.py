@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+from contextlib import closing
+
+import pytest
+from conftest import FakeRedisCache
+
+from app.quota import QuotaManager
+from app.quota_store import SQLiteQuotaStore, hash_api_key
+
+
+class InterleavingRedisCache(FakeRedisCache):
+    """Yields to the event loop around every call to mimic network round trips."""
+
+    async def incrby(self, key: str, amount: int) -> int:
+        await asyncio.sleep(0)
+        value = await super().incrby(key, amount)
+        await asyncio.sleep(0)
+        return value
+
+
+def used_counter(cache: FakeRedisCache, api_key: str) -> int:
+    return sum(value for key, value in cache.counters.items() if key.startswith(f"quota:used:{api_key}:"))
+
+
+@pytest.mark.asyncio()
+async def test_quota_served_from_local_lease(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "1000"
+    quota = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+
+    for _ in range(settings.quota_lease_size):
+        assert await quota.consume("sk_test")
+
+    assert used_counter(cache, "sk_test") == settings.quota_lease_size
+    await quota.flush()
+    assert used_counter(cache, "sk_test") == settings.quota_lease_size
+
+
+@pytest.mark.asyncio()
+async def test_quota_exhausted(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "3"
+    quota = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+
+    results = [await quota.consume("sk_test") for _ in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert used_counter(cache, "sk_test") == 3
+
+
+@pytest.mark.asyncio()
+async def test_quota_non_positive_limit_is_unlimited(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "0"
+    quota = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+
+    assert all([await quota.consume("sk_test", 100) for _ in range(10)])
+    assert used_counter(cache, "sk_test") == 0
+
+
+@pytest.mark.asyncio()
+async def test_quota_no_overshoot_across_workers(settings):
+    limit = 1000
+    workers = 8
+    cache = InterleavingRedisCache()
+    cache.store["quota:limit:sk_test"] = str(limit)
+    managers = [QuotaManager(settings=settings, cache=cache) for _ in range(workers)]  # type: ignore[arg-type]
+    rng = random.Random(42)
+
+    async def request() -> int:
+        units = rng.choice((1, 1, 1, 5, 20))
+        allowed = await rng.choice(managers).consume("sk_test", units)
+        return units if allowed else 0
+
+    granted = sum(await asyncio.gather(*(request() for _ in range(2000))))
+    for manager in managers:
+        await manager.flush()
+
+    assert granted <= limit
+    assert granted >= limit - workers * settings.quota_lease_size
+    assert used_counter(cache, "sk_test") == granted
+
+
+@pytest.fixture()
+def quota_store(tmp_path):
+    store = SQLiteQuotaStore(str(tmp_path / "quota.sqlite3"))
+    with closing(sqlite3.connect(str(tmp_path / "quota.sqlite3"))) as connection, connection:
+        connection.execute("INSERT INTO accounts (id, monthly_quota) VALUES ('acct_1', 3)")
+        connection.execute(
+            "INSERT INTO api_keys (id, owner_id, hashed_secret) VALUES ('key_1', 'acct_1', ?)",
+            (hash_api_key("sk_test"),),
+        )
+    return store, tmp_path / "quota.sqlite3"
+
+
+@pytest.mark.asyncio()
+async def test_quota_limits_loaded_and_usage_written_to_store(settings, quota_store):
+    store, path = quota_store
+    cache = FakeRedisCache()
+    quota = QuotaManager(settings=settings, cache=cache, store=store)  # type: ignore[arg-type]
+    await quota.startup()
+
+    results = [await quota.consume("sk_test") for _ in range(4)]
+    await quota.sync()
+
+    assert results == [True, True, True, False]
+    with closing(sqlite3.connect(str(path))) as connection:
+        assert connection.execute("SELECT quota_used FROM accounts").fetchone() == (3,)
+
+
+@pytest.mark.asyncio()
+async def test_missing_counter_seeded_from_store_usage(settings, quota_store):
+    store, path = quota_store
+    with closing(sqlite3.connect(str(path))) as connection, connection:
+        connection.execute("UPDATE accounts SET quota_used = 2")
+    cache = FakeRedisCache()
+    quota = QuotaManager(settings=settings, cache=cache, store=store)  # type: ignore[arg-type]
+    await quota.startup()
+
+    results = [await quota.consume("sk_test") for _ in range(3)]
+
+    assert results == [True, False, False]
+    assert sum(value for key, value in cache.counters.items() if key.startswith("quota:used:acct:acct_1:")) == 3
+
+
+@pytest.mark.asyncio()
+async def test_unpublished_limit_uses_default_quota(settings):
+    cache = FakeRedisCache()
+    quota = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+
+    assert settings.default_monthly_quota == 25000
+    assert all([await quota.consume("sk_other", 1000) for _ in range(25)])
+    assert not await quota.consume("sk_other", 1000)
+
+
+@pytest.mark.asyncio()
+async def test_idle_leases_returned_on_sync(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "1000"
+    quota = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+    await quota.startup()
+    assert await quota.consume("sk_test")
+
+    await quota.sync()
+    assert used_counter(cache, "sk_test") == settings.quota_lease_size
+    await quota.sync()
+    assert used_counter(cache, "sk_test") == 1
+
+
+@pytest.mark.asyncio()
+async def test_leases_of_dead_worker_reclaimed(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "1000"
+    crashed = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+    survivor = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+    await crashed.startup()
+    await survivor.startup()
+    for _ in range(3):
+        assert await crashed.consume("sk_test")
+    await crashed.sync()
+
+    cache.store.pop(f"quota:worker:{crashed._worker_id}")
+    await survivor.sync()
+    await survivor.sync()
+
+    assert used_counter(cache, "sk_test") == 3
+
+
+class FailingQuotaStore:
+    def __init__(self) -> None:
+        self.failing = False
+
+    def load_accounts(self) -> dict:
+        if self.failing:
+            raise sqlite3.OperationalError("database is locked")
+        return {}
+
+    def add_usage(self, usage) -> None:  # noqa: ANN001
+        if self.failing:
+            raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.mark.asyncio()
+async def test_store_failure_keeps_heartbeat_and_leases(settings):
+    cache = FakeRedisCache()
+    cache.store["quota:limit:sk_test"] = "1000"
+    store = FailingQuotaStore()
+    worker = QuotaManager(settings=settings, cache=cache, store=store)  # type: ignore[arg-type]
+    other = QuotaManager(settings=settings, cache=cache)  # type: ignore[arg-type]
+    await worker.startup()
+    await other.startup()
+    assert await worker.consume("sk_test")
+
+    store.failing = True
+    cache.store.pop(f"quota:worker:{worker._worker_id}")
+    await worker.sync()
+    await other.sync()
+
+    assert f"quota:worker:{worker._worker_id}" in cache.store
+    assert used_counter(cache, "sk_test") == settings.quota_lease_size
+    assert worker._consumed["sk_test"] == 1
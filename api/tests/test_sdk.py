@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import pathlib
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "sdk" / "python"))
+
+from emailshield import AsyncEmailShieldClient  # noqa: E402
+
+
+def result_for(email: str) -> dict:
+    return {"email": email, "classification": "ok", "score": 0.0, "reasons": ["mx_ok"], "ttl_seconds": 60}
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        body = json.loads(request.content)
+        if request.url.path == "/v1/check-bulk":
+            emails = [item["email"] for item in body["emails"]]
+            errors = [
+                {"loc": ["body", "emails", index, "email"], "msg": "invalid email"}
+                for index, email in enumerate(emails)
+                if "@" not in email
+            ]
+            if errors:
+                return httpx.Response(422, json={"detail": errors})
+            return httpx.Response(200, json={"results": [result_for(email) for email in emails]})
+        if "@" not in body["email"]:
+            return httpx.Response(422, json={"detail": "invalid_email"})
+        return httpx.Response(200, json=result_for(body["email"]))
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_checks_coalesced_into_bulk():
+    handler = RecordingHandler()
+    async with AsyncEmailShieldClient(
+        "sk_test", base_url="http://test", batching=True, transport=httpx.MockTransport(handler)
+    ) as client:
+        emails = [f"user{i}@example.com" for i in range(25)]
+        results = await asyncio.gather(*(client.check_email(email) for email in emails))
+
+    assert [result.email for result in results] == emails
+    assert handler.paths == ["/v1/check-bulk"]
+
+
+@pytest.mark.asyncio()
+async def test_batches_split_at_max_batch_size():
+    handler = RecordingHandler()
+    async with AsyncEmailShieldClient(
+        base_url="http://test", batching=True, max_batch_size=10, transport=httpx.MockTransport(handler)
+    ) as client:
+        await asyncio.gather(*(client.check_email(f"user{i}@example.com") for i in range(25)))
+
+    assert handler.paths == ["/v1/check-bulk"] * 3
+
+
+@pytest.mark.asyncio()
+async def test_invalid_item_error_isolated():
+    handler = RecordingHandler()
+    async with AsyncEmailShieldClient(
+        base_url="http://test", batching=True, transport=httpx.MockTransport(handler)
+    ) as client:
+        results = await asyncio.gather(
+            client.check_email("good@example.com"),
+            client.check_email("not-an-email"),
+            client.check_email("fine@example.com"),
+            return_exceptions=True,
+        )
+
+    assert results[0].email == "good@example.com"
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[2].email == "fine@example.com"
+    assert handler.paths == ["/v1/check-bulk", "/v1/check-bulk"]
+
+
+@pytest.mark.asyncio()
+async def test_invalid_item_isolated_against_rate_limited_app(client):
+    app = client.app
+    app.state.cache.store["mx:example.com"] = "1"
+    emails = [f"user{i}@example.com" for i in range(30)] + ["bad"]
+    async with AsyncEmailShieldClient(
+        "sk_test", base_url="http://test", batching=True, transport=httpx.ASGITransport(app=app)
+    ) as sdk:
+        results = await asyncio.gather(*(sdk.check_email(email) for email in emails), return_exceptions=True)
+
+    assert [result.email for result in results[:30]] == emails[:30]
+    assert isinstance(results[30], httpx.HTTPStatusError)
+    assert results[30].response.status_code == 422
+    assert app.state.cache.counters["rate:sk_test"] == 2
@@ -0,0 +1,30 @@
+"""Micro-benchmark for the lookalike/typo domain index used on every check."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "api"))
+
+from app.lookalike import LookalikeIndex  # noqa: E402
+
+SAMPLES = {
+    "known provider": "gmail.com",
+    "typo (transposition)": "gmial.com",
+    "typo (missing letter)": "outlok.fr",
+    "unrelated domain": "example.com",
+    "long domain": "mail.example-company.io",
+}
+
+
+def main(number: int = 200_000) -> None:
+    index = LookalikeIndex()
+    for label, domain in SAMPLES.items():
+        elapsed = timeit.timeit(lambda: index.suggest(domain), number=number)
+        print(f"{label:<24} {domain:<26} {elapsed / number * 1e6:7.2f} us/lookup -> {index.suggest(domain)}")
+
+
+if __name__ == "__main__":
+    main()